@@ -1,106 +1,478 @@
 import os
-import json
+import contextlib
 import datetime
+import functools
+import gzip
+import io
+import threading
+import time
+import orjson
 import requests
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import urlencode
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from flask import Flask, jsonify, request
+from flask.json.provider import DefaultJSONProvider
 
 from google.cloud import storage
 from google.cloud import secretmanager
 from google.cloud import firestore
+from google.api_core.exceptions import NotFound, PreconditionFailed
+from google.resumable_media import InvalidResponse
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """
+    Flask JSON provider backed by orjson.
+    Keeps Flask's sorted keys and its fallbacks for dates and other types.
+    """
+
+    def dumps(self, obj, **kwargs) -> str:
+        option = orjson.OPT_PASSTHROUGH_DATETIME
+        if kwargs.get("sort_keys", self.sort_keys):
+            option |= orjson.OPT_SORT_KEYS
+        if kwargs.get("indent"):
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=kwargs.get("default", self.default), option=option).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
 
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 
 # Support both env naming styles
 STATE_COLLECTION = os.environ.get("STATE_COLLECTION") or os.environ.get("CURSOR_COLLECTION") or "cursors"
 STATE_DOC_ID = os.environ.get("STATE_DOC_ID") or os.environ.get("CURSOR_DOC") or "tmdb_discover"
 
+# Concurrent TMDB page fetches; TMDB allows ~40 req/s
+TMDB_MAX_WORKERS = int(os.environ.get("TMDB_MAX_WORKERS", "16"))
+
+# When TMDB reports fewer remaining requests than we have workers, all workers
+# hold off sending for this long; Retry-After waits are capped so a large value
+# can't outlast the Cloud Run request timeout
+TMDB_THROTTLE_SECONDS = float(os.environ.get("TMDB_THROTTLE_SECONDS", "1.0"))
+TMDB_MAX_RETRY_AFTER_SECONDS = float(os.environ.get("TMDB_MAX_RETRY_AFTER_SECONDS", "10"))
+_tmdb_resume_at = 0.0
+_tmdb_gate_lock = threading.Lock()
+
+
+class CappedRetry(Retry):
+    def get_retry_after(self, response):
+        retry_after = super().get_retry_after(response)
+        if retry_after is None:
+            return None
+        return min(retry_after, TMDB_MAX_RETRY_AFTER_SECONDS)
+
+
+# One keep-alive pool for all TMDB calls; retries 429/5xx with backoff,
+# waiting as long as Retry-After asks (up to the cap) when TMDB sends it
+SESSION = requests.Session()
+SESSION.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=1,
+        pool_maxsize=TMDB_MAX_WORKERS,
+        max_retries=CappedRetry(
+            total=5,
+            backoff_factor=0.3,
+            status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods=["GET"],
+            respect_retry_after_header=True,
+        ),
+    ),
+)
+
+# FORMAT=parquet writes zstd Parquet instead of gzipped NDJSON
+OUTPUT_FORMAT = os.environ.get("FORMAT", "jsonl")
+if OUTPUT_FORMAT not in ("jsonl", "parquet"):
+    raise ValueError(f"FORMAT must be 'jsonl' or 'parquet', got {OUTPUT_FORMAT!r}")
+
+# SLIM=1 uploads only the TMDB fields downstream tables use
+SLIM_ROWS = os.environ.get("SLIM", "0") == "1"
+SLIM_FIELDS = (
+    "id",
+    "title",
+    "original_title",
+    "popularity",
+    "vote_average",
+    "vote_count",
+    "release_date",
+    "genre_ids",
+    "overview",
+    "adult",
+    "original_language",
+)
+
+# Secret values are memoized per instance for this long
+SECRET_TTL_SECONDS = int(os.environ.get("SECRET_TTL_SECONDS", "600"))
+_secret_cache = {}
+_secret_cache_lock = threading.Lock()
+
+# Resumable upload chunk size (must be a multiple of 256 KiB)
+GCS_CHUNK_SIZE = 256 * 1024
+GZIP_LEVEL = 5
+
+
+# GCP clients are built once per instance and reuse their channels across requests
+@functools.lru_cache(maxsize=1)
+def get_storage_client() -> storage.Client:
+    return storage.Client()
+
+
+@functools.lru_cache(maxsize=1)
+def get_secret_client() -> secretmanager.SecretManagerServiceClient:
+    return secretmanager.SecretManagerServiceClient()
+
+
+@functools.lru_cache(maxsize=1)
+def get_firestore_client(project_id: str) -> firestore.Client:
+    return firestore.Client(project=project_id)
+
+
+class TmdbUnauthorizedError(RuntimeError):
+    pass
+
 
 def get_secret(project_id: str, secret_name: str) -> str:
-    client = secretmanager.SecretManagerServiceClient()
+    key = (project_id, secret_name)
+    now = time.monotonic()
+    with _secret_cache_lock:
+        cached = _secret_cache.get(key)
+        if cached and cached[1] > now:
+            return cached[0]
+
+    client = get_secret_client()
     name = f"projects/{project_id}/secrets/{secret_name}/versions/latest"
     response = client.access_secret_version(request={"name": name})
-    return response.payload.data.decode("UTF-8").strip()
+    value = response.payload.data.decode("UTF-8").strip()
+
+    with _secret_cache_lock:
+        _secret_cache[key] = (value, now + SECRET_TTL_SECONDS)
+    return value
+
+
+def invalidate_secret(project_id: str, secret_name: str) -> None:
+    with _secret_cache_lock:
+        _secret_cache.pop((project_id, secret_name), None)
+
+
+def is_gcs_collision(error: Exception) -> bool:
+    return isinstance(error, InvalidResponse) and error.response.status_code == 412
 
 
-def upload_to_gcs(bucket_name: str, gcs_path: str, content: str) -> None:
-    storage_client = storage.Client()
-    bucket = storage_client.bucket(bucket_name)
+def upload_to_gcs(bucket_name: str, gcs_path: str, chunks) -> None:
+    bucket = get_storage_client().bucket(bucket_name)
     blob = bucket.blob(gcs_path)
-    blob.upload_from_string(content, content_type="application/x-ndjson")
+    # GCS serves it decompressed to clients that don't accept gzip
+    blob.content_encoding = "gzip"
+    # Stream NDJSON through a resumable upload instead of building the whole payload.
+    # if_generation_match=0 makes GCS reject the write if the object already exists.
+    streamed = False
+    try:
+        with blob.open(
+            "wb", content_type="application/x-ndjson", chunk_size=GCS_CHUNK_SIZE, if_generation_match=0
+        ) as raw:
+            with gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=GZIP_LEVEL) as f:
+                for chunk in chunks:
+                    f.write(chunk)
+                streamed = True
+    except Exception as e:
+        # The writer surfaces a raw 412; that object belongs to another run, so leave it alone
+        if is_gcs_collision(e):
+            # The writer still uploads from __exit__ when the stream itself failed, so the
+            # 412 can mask the real error (e.g. a TMDB 401); report that one instead
+            original = e.__context__
+            while original is not None and is_gcs_collision(original):
+                original = original.__context__
+            if streamed or original is None:
+                raise PreconditionFailed(f"gs://{bucket_name}/{gcs_path} already exists") from e
+            raise original
+        # The writer finalizes whatever it buffered even on error, so a truncated object
+        # exists (and OBJECT_FINALIZE triggers fire) until it's removed here. Downstream
+        # triggers can still see it briefly. Pin the delete to the generation we just read.
+        with contextlib.suppress(NotFound, PreconditionFailed):
+            blob.reload()
+            blob.delete(if_generation_match=blob.generation)
+        raise
+
+
+def ndjson_chunks(batches, now_ts: str, batch_date: str):
+    """
+    Yields the NDJSON for each TMDB page as one bytes-like chunk, with the
+    ingestion fields appended to every row. The batch-invariant fields are
+    serialized once and spliced onto each row's JSON in place of its closing
+    brace, so rows are never mutated. A TMDB row that already has one of the
+    injected keys is copied without it first, so our value wins as it did
+    when the fields were assigned onto the dict.
+    With SLIM=1 each row is first projected down to SLIM_FIELDS.
+    """
+    const = orjson.dumps(
+        {"ingestion_timestamp": now_ts, "batch_date": batch_date, "source": "tmdb_discover_movie"}
+    )
+    prefix = b"," + const[1:-1] + b',"pulled_page":'
+    injected = frozenset(("ingestion_timestamp", "batch_date", "source", "pulled_page"))
+    dumps = orjson.dumps
+    # Lets numpy/pandas batches and naive datetimes serialize without a default= hook
+    option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NAIVE_UTC
+
+    for page, results in batches:
+        suffix = prefix + str(page).encode() + b"}\n"
+        # An empty row has no field to put the comma after
+        empty_row = b"{" + suffix[1:]
+        buf = bytearray()
+        for m in slim_rows(results):
+            if not injected.isdisjoint(m):
+                m = {k: v for k, v in m.items() if k not in injected}
+            row = dumps(m, option=option)
+            if row == b"{}":
+                buf += empty_row
+            else:
+                buf += row
+                buf[-1:] = suffix
+        if buf:
+            yield buf
+
+
+def slim_rows(results):
+    if not SLIM_ROWS:
+        return results
+    return ({k: m[k] for k in SLIM_FIELDS if k in m} for m in results)
+
+
+@functools.lru_cache(maxsize=1)
+def get_parquet_schemas():
+    """
+    Fixed Parquet schemas so every file under a batch_date= prefix has the same
+    columns and types, whatever a given run's rows happen to contain.
+    Returns (TMDB columns, TMDB + ingestion columns).
+    """
+    import pyarrow as pa
+
+    tmdb_fields = [
+        pa.field("adult", pa.bool_()),
+        pa.field("backdrop_path", pa.string()),
+        pa.field("genre_ids", pa.list_(pa.int64())),
+        pa.field("id", pa.int64()),
+        pa.field("original_language", pa.string()),
+        pa.field("original_title", pa.string()),
+        pa.field("overview", pa.string()),
+        pa.field("popularity", pa.float64()),
+        pa.field("poster_path", pa.string()),
+        pa.field("release_date", pa.string()),
+        pa.field("title", pa.string()),
+        pa.field("video", pa.bool_()),
+        pa.field("vote_average", pa.float64()),
+        pa.field("vote_count", pa.int64()),
+    ]
+    if SLIM_ROWS:
+        tmdb_fields = [f for f in tmdb_fields if f.name in SLIM_FIELDS]
+
+    ingestion_fields = [
+        pa.field("ingestion_timestamp", pa.string()),
+        pa.field("batch_date", pa.string()),
+        pa.field("source", pa.string()),
+        pa.field("pulled_page", pa.int64()),
+    ]
+    return pa.schema(tmdb_fields), pa.schema(tmdb_fields + ingestion_fields)
+
+
+def upload_parquet_to_gcs(bucket_name: str, gcs_path: str, batches, now_ts: str, batch_date: str) -> None:
+    # Only needed for FORMAT=parquet, so keep it off the default import path
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    tmdb_schema, schema = get_parquet_schemas()
+
+    # Parquet is columnar, so the batch is materialized before writing. The schema
+    # picks the TMDB columns (which also applies SLIM); the ingestion columns are
+    # added once for the whole table rather than stored on every row.
+    rows = []
+    pulled_pages = []
+    for page, results in batches:
+        rows.extend(results)
+        pulled_pages.extend([page] * len(results))
+
+    table = pa.Table.from_pylist(rows, schema=tmdb_schema)
+    n = table.num_rows
+    table = pa.Table.from_arrays(
+        table.columns
+        + [
+            pa.repeat(pa.scalar(now_ts, pa.string()), n),
+            pa.repeat(pa.scalar(batch_date, pa.string()), n),
+            pa.repeat(pa.scalar("tmdb_discover_movie", pa.string()), n),
+            pa.array(pulled_pages, pa.int64()),
+        ],
+        schema=schema,
+    )
+
+    buf = io.BytesIO()
+    pq.write_table(table, buf, compression="zstd")
+
+    blob = get_storage_client().bucket(bucket_name).blob(gcs_path)
+    blob.upload_from_string(buf.getvalue(), content_type="application/octet-stream", if_generation_match=0)
+
+
+@functools.lru_cache(maxsize=1)
+def get_state_ref(db: firestore.Client) -> firestore.DocumentReference:
+    return db.collection(STATE_COLLECTION).document(STATE_DOC_ID)
 
 
 def get_firestore_state(db: firestore.Client):
-    doc_ref = db.collection(STATE_COLLECTION).document(STATE_DOC_ID)
-    snap = doc_ref.get()
-    if snap.exists:
-        return snap.to_dict() or {}
-    return {}
+    # to_dict() is None for a missing doc
+    return get_state_ref(db).get().to_dict() or {}
 
 
 def set_firestore_state(db: firestore.Client, **fields):
-    doc_ref = db.collection(STATE_COLLECTION).document(STATE_DOC_ID)
     fields["updated_at_utc"] = datetime.datetime.utcnow().isoformat()
-    doc_ref.set(fields, merge=True)
+    get_state_ref(db).set(fields, merge=True)
+
+
+def safe_error_message(error: Exception) -> str:
+    # requests errors embed the request URL, which carries the v3 api_key
+    if isinstance(error, requests.RequestException):
+        status = getattr(error.response, "status_code", None)
+        name = type(error).__name__
+        return f"{name} (HTTP {status})" if status is not None else name
+    return str(error)
+
+
+def wait_for_tmdb_gate() -> None:
+    with _tmdb_gate_lock:
+        delay = _tmdb_resume_at - time.monotonic()
+    if delay > 0:
+        time.sleep(delay)
+
+
+def pause_tmdb_gate(seconds: float) -> bool:
+    """Holds every worker's next request for `seconds`; False if already paused."""
+    global _tmdb_resume_at
+    with _tmdb_gate_lock:
+        now = time.monotonic()
+        if _tmdb_resume_at > now:
+            return False
+        _tmdb_resume_at = now + seconds
+        return True
 
 
-def tmdb_discover_movies(tmdb_credential: str, start_page: int, pages: int, auth_mode: str):
+def tmdb_fetch_page(url: str, headers: dict) -> dict:
+    # Hold off before sending while TMDB says we're close to its limit
+    wait_for_tmdb_gate()
+    r = SESSION.get(url, headers=headers, timeout=30)
+
+    # If unauthorized, stop and raise a useful error
+    if r.status_code == 401:
+        raise TmdbUnauthorizedError("TMDB returned 401 Unauthorized. Your TMDB key/token is invalid or wrong auth mode.")
+
+    r.raise_for_status()
+
+    remaining = r.headers.get("X-RateLimit-Remaining")
+    if remaining is not None and remaining.isdigit() and int(remaining) < TMDB_MAX_WORKERS:
+        if pause_tmdb_gate(TMDB_THROTTLE_SECONDS):
+            app.logger.warning("TMDB rate limit nearly exhausted (%s remaining), throttling", remaining)
+
+    return orjson.loads(r.content)
+
+
+def tmdb_discover_movies(tmdb_credential: str, start_page: int, pages: int, auth_mode: str, progress: dict):
     """
     TMDB discover returns ~20 results per page.
     For ~2000 rows per run -> pages ~100.
+    Pages are fetched concurrently (bounded by TMDB_MAX_WORKERS) and handled
+    as they complete. Yields (page, results) in page order as the contiguous
+    run from start_page grows, so rows can be written while later pages are
+    still in flight. progress gets last_success_page, total_pages and rows,
+    plus failed_page/error when a page failure cut the run short.
     auth_mode:
       - "v3" -> uses ?api_key=
       - "v4" -> uses Authorization: Bearer <token>
     """
     base_url = "https://api.themoviedb.org/3/discover/movie"
 
-    all_rows = []
-    now_ts = datetime.datetime.utcnow().isoformat()
-    batch_date = datetime.date.today().isoformat()
-
-    end_page = start_page + pages - 1
-    last_success_page = start_page - 1
-    last_total_pages = None
-
-    for page in range(start_page, end_page + 1):
-        params = {
-            "language": "en-US",
-            "sort_by": "popularity.desc",
-            "page": page,
-        }
-
-        headers = {"accept": "application/json"}
-
-        if auth_mode == "v3":
-            params["api_key"] = tmdb_credential
-        else:
-            headers["Authorization"] = f"Bearer {tmdb_credential}"
-
-        r = requests.get(base_url, headers=headers, params=params, timeout=30)
-
-        # If unauthorized, stop and raise a useful error
-        if r.status_code == 401:
-            raise RuntimeError("TMDB returned 401 Unauthorized. Your TMDB key/token is invalid or wrong auth mode.")
+    # Only the page number changes between requests, so build auth, headers
+    # and the rest of the query string once
+    base_params = {
+        "language": "en-US",
+        "sort_by": "popularity.desc",
+    }
+    headers = {"accept": "application/json"}
 
-        r.raise_for_status()
-        data = r.json()
+    if auth_mode == "v3":
+        base_params["api_key"] = tmdb_credential
+    else:
+        headers["Authorization"] = f"Bearer {tmdb_credential}"
 
-        total_pages = int(data.get("total_pages", 0) or 0)
-        last_total_pages = total_pages if total_pages else last_total_pages
+    page_url = f"{base_url}?{urlencode(base_params)}&page="
 
-        if total_pages and page > total_pages:
-            break
+    end_page = start_page + pages - 1
+    progress["last_success_page"] = start_page - 1
+    progress["total_pages"] = None
+    progress["rows"] = 0
+    progress["failed_page"] = None
+    progress["error"] = None
 
-        results = data.get("results", [])
-        for m in results:
-            m["ingestion_timestamp"] = now_ts
-            m["batch_date"] = batch_date
-            m["source"] = "tmdb_discover_movie"
-            m["pulled_page"] = page
-            all_rows.append(m)
+    pages_by_num = {}
+    failed_pages = {}
+    next_page = start_page
 
-        last_success_page = page
+    executor = ThreadPoolExecutor(max_workers=max(1, min(TMDB_MAX_WORKERS, pages)))
+    try:
+        futures = {
+            executor.submit(tmdb_fetch_page, f"{page_url}{page}", headers): page
+            for page in range(start_page, end_page + 1)
+        }
 
-    return all_rows, last_success_page, last_total_pages
+        # Handle pages as they land so a slow page doesn't hold up the rest
+        for future in as_completed(futures):
+            if future.cancelled():
+                continue
+            page = futures[future]
+            try:
+                data = future.result()
+            except TmdbUnauthorizedError:
+                raise
+            except Exception as e:
+                failed_pages[page] = e
+                # Pages after a failure can't be part of the contiguous run
+                for f, p in futures.items():
+                    if p > page:
+                        f.cancel()
+            else:
+                total_pages = int(data.get("total_pages", 0) or 0)
+                pages_by_num[page] = (total_pages, data.get("results", []))
+
+            # Emit the contiguous run as far as it reaches now
+            while next_page in pages_by_num:
+                total_pages, results = pages_by_num.pop(next_page)
+                if total_pages:
+                    progress["total_pages"] = total_pages
+
+                if total_pages and next_page > total_pages:
+                    return
+
+                yield next_page, results
+
+                progress["last_success_page"] = next_page
+                progress["rows"] += len(results)
+                next_page += 1
+
+            if next_page in failed_pages:
+                # Nothing fetched yet -> surface the error; otherwise keep what we have
+                error = failed_pages[next_page]
+                if next_page == start_page:
+                    raise error
+                message = safe_error_message(error)
+                app.logger.warning(
+                    "TMDB page %s failed (%s); keeping pages %s-%s", next_page, message, start_page, next_page - 1
+                )
+                progress["failed_page"] = next_page
+                progress["error"] = message
+                return
+    finally:
+        # Don't wait on pages we are going to throw away
+        executor.shutdown(wait=True, cancel_futures=True)
 
 
 @app.get("/")
@@ -111,7 +483,7 @@ def health():
 @app.get("/state")
 def read_state():
     project_id = os.environ["PROJECT_ID"]
-    db = firestore.Client(project=project_id)
+    db = get_firestore_client(project_id)
     state = get_firestore_state(db)
     return jsonify({"collection": STATE_COLLECTION, "doc": STATE_DOC_ID, "state": state})
 
@@ -126,33 +498,62 @@ def run_ingestion():
         # 100 pages ~ 2000 rows (20/page)
         default_pages = int(os.environ.get("PAGES_PER_RUN", "100"))
 
-        db = firestore.Client(project=project_id)
-        state = get_firestore_state(db)
+        db = get_firestore_client(project_id)
+
+        # Secret and cursor reads are independent RPCs; overlap them
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            secret_future = executor.submit(get_secret, project_id, secret_name)
+            state_future = executor.submit(get_firestore_state, db)
+            tmdb_credential = secret_future.result()
+            state = state_future.result()
+
         next_page = int(state.get("next_page", 1))
 
         start_page = int(request.args.get("start_page", next_page))
         pages = int(request.args.get("pages", default_pages))
 
-        tmdb_credential = get_secret(project_id, secret_name)
-
         # Decide auth mode:
         # If token looks long (v4 tokens are long), use v4, else v3
         auth_mode = "v4" if len(tmdb_credential) > 40 else "v3"
 
-        rows, last_success_page, total_pages = tmdb_discover_movies(
-            tmdb_credential, start_page=start_page, pages=pages, auth_mode=auth_mode
-        )
-
-        batch_date = datetime.date.today().isoformat()
-        ts_compact = datetime.datetime.utcnow().strftime("%Y%m%dT%H%M%SZ")
+        # One clock read for the row timestamps, partition and object name
+        now = datetime.datetime.utcnow()
+        now_ts = now.isoformat()
+        batch_date = now.date().isoformat()
+        ts_compact = now.strftime("%Y%m%dT%H%M%SZ")
 
+        # The object is opened before paging finishes, so its name only carries
+        # the start page; the state doc records where the run actually ended
         gcs_path = (
             f"raw/api/batch_date={batch_date}/"
-            f"movies_pages_{start_page}_to_{last_success_page}_{ts_compact}.jsonl"
+            f"movies_pages_{start_page}_{ts_compact}"
+            f".{OUTPUT_FORMAT}"
         )
 
-        jsonl = "\n".join(json.dumps(r, ensure_ascii=False) for r in rows) + "\n"
-        upload_to_gcs(bucket_name, gcs_path, jsonl)
+        # Fetch, serialize and upload in one pass (Parquet buffers the batch first)
+        progress = {}
+        batches = tmdb_discover_movies(
+            tmdb_credential, start_page=start_page, pages=pages, auth_mode=auth_mode, progress=progress
+        )
+        try:
+            if OUTPUT_FORMAT == "parquet":
+                upload_parquet_to_gcs(bucket_name, gcs_path, batches, now_ts, batch_date)
+            else:
+                upload_to_gcs(bucket_name, gcs_path, ndjson_chunks(batches, now_ts, batch_date))
+        except PreconditionFailed:
+            # Another invocation already wrote this object; keep it and leave the cursor alone
+            return jsonify(
+                {
+                    "message": "ingestion_skipped",
+                    "already_uploaded": True,
+                    "gcs_path": f"gs://{bucket_name}/{gcs_path}",
+                    "start_page": start_page,
+                }
+            )
+
+        last_success_page = progress["last_success_page"]
+        total_pages = progress["total_pages"]
+        row_count = progress["rows"]
 
         new_next_page = last_success_page + 1
         if total_pages and new_next_page > total_pages:
@@ -163,16 +564,18 @@ def run_ingestion():
             next_page=new_next_page,
             last_run_start_page=start_page,
             last_run_end_page=last_success_page,
-            last_run_rows=len(rows),
+            last_run_rows=row_count,
             last_run_gcs_path=f"gs://{bucket_name}/{gcs_path}",
             total_pages=total_pages,
             tmdb_auth_mode=auth_mode,
+            last_run_failed_page=progress["failed_page"],
+            last_run_error=progress["error"],
         )
 
         return jsonify(
             {
                 "message": "ingestion_success",
-                "rows": len(rows),
+                "rows": row_count,
                 "gcs_path": f"gs://{bucket_name}/{gcs_path}",
                 "start_page": start_page,
                 "end_page": last_success_page,
@@ -180,10 +583,17 @@ def run_ingestion():
                 "next_page_saved": new_next_page,
                 "total_pages_seen": total_pages,
                 "tmdb_auth_mode": auth_mode,
+                "failed_page": progress["failed_page"],
+                "error": progress["error"],
             }
         )
 
+    except TmdbUnauthorizedError as e:
+        # The key may have been rotated; refetch it on the next run
+        invalidate_secret(project_id, secret_name)
+        return jsonify({"message": "ingestion_failed", "error": str(e)}), 500
+
     except Exception as e:
         # Return JSON error instead of blank Internal Server Error page
-        return jsonify({"message": "ingestion_failed", "error": str(e)}), 500
+        return jsonify({"message": "ingestion_failed", "error": safe_error_message(e)}), 500
 